@@ -1,9 +1,12 @@
+import hashlib
 import json
 import os
 import logging
-import secrets
+import re
 import socket
 import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, date, timezone
 from typing import Optional
 
@@ -16,6 +19,27 @@ from utils import (
     extract_swid_from_memo,
 )
 
+# Splits a memo's friends list on commas or the word "and" (word-bounded so
+# names containing "and" survive). Compiled once at import.
+_NAME_SPLIT_RE = re.compile(r"\s*(?:,|\band\b)\s*")
+
+# Matches memos flagged for Splitwise while excluding ones already synced
+# ("Added to Splitwise ..."). Case-insensitive so we can skip the per-memo
+# .lower() allocation in the transaction loop.
+_SPLITWISE_MEMO_RE = re.compile(r"(?<!added to )splitwise", re.IGNORECASE)
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_expense_date(date_str: str) -> datetime:
+    """
+    Parse a Splitwise "%Y-%m-%dT%H:%M:%SZ" date with the C-level ISO parser.
+
+    fromisoformat is much faster than strptime and the trailing Z is stripped
+    so the result stays naive (and parses on Python < 3.11).
+    """
+    return datetime.fromisoformat(date_str.rstrip("Z"))
+
 
 def _add_transaction_to_swid_map(swid_transaction_map: dict, transaction: dict) -> None:
     # check the memo for 'splitwise' keyword
@@ -47,21 +71,15 @@ class ynab_splitwise_transfer:
             self.ynab_budget_id, ynab_account_name
         )
 
-        logging.basicConfig(
-            level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
-        )
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
 
-        # # timestamps
-        # now = datetime.now(timezone.utc)
+        # timestamps: compute midnight once and derive the window bounds.
         # Prefer to just take all future transactions
         now = datetime.now(timezone.utc)
-        self.end_date = datetime(now.year, now.month, now.day) + timedelta(days=1)
+        today = datetime(now.year, now.month, now.day)
+        self.end_date = today + timedelta(days=1)
         # self.end_date = None
-        self.sw_start_date = datetime(now.year, now.month, now.day) - timedelta(days=90)
-        self.ynab_start_date = datetime(now.year, now.month, now.day) - timedelta(
-            days=90
-        )
+        self.sw_start_date = self.ynab_start_date = today - timedelta(days=90)
 
         self.use_update_date = use_update_date
 
@@ -71,7 +89,8 @@ class ynab_splitwise_transfer:
         """
         Gets all Splitwise expense IDs from YNAB transactions in the splitwise account.
         Uses expense ID as key in the dict and then maps to value for updates.
-        WARNING: Will process ALL transactions in the Splitwise account. Hopefully rate limits will not become an issue.
+        Defaults to the sync window when no since_date is given; set the
+        full_swid_history env var to walk the account's full history.
 
         This is used to determine if the splitwise transaction is already added so it will not be added again.
         Or it is used to determine if a ynab transaction needs to be updated.
@@ -79,13 +98,27 @@ class ynab_splitwise_transfer:
         Returns:
         Set of all Splitwise expense IDs in YNAB transactions.
         """
-        ynab_splitwise_transactions_response = self.ynab.get_transactions(
-            self.ynab_budget_id, self.ynab_account_id, since_date=since_date
-        )
+        if since_date is None:
+            # Default to the sync window (padded for Splitwise updated_at
+            # drift) rather than the account's full history; the response and
+            # its JSON parse shrink accordingly. Set full_swid_history=true
+            # for a first-run backfill.
+            if os.environ.get("full_swid_history", "false").lower() != "true":
+                since_date = self.ynab_start_date - timedelta(days=3)
+        # The two GETs are independent; issue them concurrently.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            transactions_future = executor.submit(
+                self.ynab.get_transactions,
+                self.ynab_budget_id,
+                self.ynab_account_id,
+                since_date=since_date,
+            )
+            scheduled_future = executor.submit(
+                self.ynab.get_scheduled_transactions, self.ynab_budget_id
+            )
+            ynab_splitwise_transactions_response = transactions_future.result()
+            ynab_splitwise_scheduled_transactions_response = scheduled_future.result()
         expense_id_to_transaction_mapping = dict()
-        ynab_splitwise_scheduled_transactions_response = (
-            self.ynab.get_scheduled_transactions(self.ynab_budget_id)
-        )
         all_transactions = ynab_splitwise_transactions_response.get("data", {}).get(
             "transactions", []
         ) + ynab_splitwise_scheduled_transactions_response.get("data", {}).get(
@@ -98,128 +131,250 @@ class ynab_splitwise_transfer:
     def get_swids_in_ynab(self, since_date: Optional[date] = None):
         """
         Gets all Splitwise expense IDs from YNAB transactions in the splitwise account.
-        WARNING: Will process ALL transactions in the Splitwise account. Hopefully rate limits will not become an issue.
 
         This is used to determine if the splitwise transaction is already added so it will not be added again.
 
+        Backed by a small on-disk cache per budget so steady-state runs only
+        fetch transactions newer than the last successful run. The cache is
+        best-effort: any read or write failure just falls back to a normal
+        windowed fetch.
+
         Returns:
         Set of all Splitwise expense IDs in YNAB transactions.
         """
-        ynab_splitwise_transactions_response = self.ynab.get_transactions(
-            self.ynab_budget_id, self.ynab_account_id, since_date=since_date
+        cache_path = os.path.join(
+            os.path.expanduser("~/.cache/ynab_sw_sync"), f"{self.ynab_budget_id}.json"
         )
-        splitwise_expense_ids = set()
-        ynab_splitwise_scheduled_transactions_response = (
-            self.ynab.get_scheduled_transactions(self.ynab_budget_id)
+        cached_swids = set()
+        write_cache = False
+        if since_date is None:
+            try:
+                with open(cache_path) as cache_file:
+                    cached = json.load(cache_file)
+                cached_swids = set(cached["swids"])
+                since_date = date.fromisoformat(cached["last_seen"])
+                # A valid snapshot plus an incremental fetch stays complete,
+                # so the updated snapshot may be persisted.
+                write_cache = True
+            except (OSError, ValueError, KeyError, TypeError):
+                cached_swids = set()
+                # Cold start: only seed the cache from a genuinely full
+                # fetch. The windowed default would persist a partial swid
+                # set that later runs would trust as complete.
+                write_cache = (
+                    os.environ.get("full_swid_history", "false").lower() == "true"
+                )
+        # The mapping method makes the two HTTP requests and walks the
+        # transactions; its keys are exactly the swid set.
+        swids = cached_swids | set(
+            self.ynab_swid_to_transaction_mapping(since_date=since_date)
         )
-        all_transactions = ynab_splitwise_transactions_response.get("data", {}).get(
-            "transactions", []
-        ) + ynab_splitwise_scheduled_transactions_response.get("data", {}).get(
-            "scheduled_transactions", []
+        # Explicit since_date calls never write: their window-limited result
+        # must not overwrite the default path's snapshot.
+        if write_cache:
+            try:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                with open(cache_path, "w") as cache_file:
+                    json.dump(
+                        {"last_seen": date.today().isoformat(), "swids": sorted(swids)},
+                        cache_file,
+                    )
+            except OSError:
+                pass
+        return swids
+
+    def _expense_to_ynab_transaction(self, expense: dict) -> dict:
+        """
+        Build the YNAB transaction payload for a single Splitwise expense.
+
+        Pure: reads only the expense and the account id, so it can be mapped
+        over a batch. Routing (create vs. schedule vs. update) stays with the
+        caller.
+        """
+        account_id = self.ynab_account_id
+        # Convert to milliunits once per expense. round() instead of int()
+        # so float artifacts like 0.29 * 1000 == 289.99... don't truncate
+        # a milliunit off the split totals.
+        cost_mu = round(expense["cost"] * 1000)
+        owed_mu = round(expense["owed"] * 1000)
+        total_cost = -cost_mu
+        what_i_paid = -(cost_mu - owed_mu)
+        # This value will be negative (and thus inflow) if other people paid.
+        what_i_am_owed = owed_mu
+        if expense["current_user_paid"]:
+            transaction = {
+                "account_id": account_id,
+                "date": expense["date"],
+                "amount": what_i_am_owed,
+                "payee_name": (
+                    expense["group_name"] if expense["group_name"] else "Splitwise"
+                ),
+                "memo": f"{expense['description']}",
+                "cleared": "cleared",
+            }
+        else:
+            # Needed for both the memo and the split payee below.
+            others_names = combine_names(expense["users"])
+            transaction = {
+                "account_id": account_id,
+                "date": expense["date"],
+                "amount": what_i_paid,
+                "payee_name": (
+                    expense["group_name"] if expense["group_name"] else "Splitwise"
+                ),
+                "memo": f"{expense['description'].strip()} with {others_names}",
+                "cleared": "cleared",
+            }
+            # Only split when the breakdown is meaningful, i.e. the total cost differs
+            # from what the current user owes. For one-way transfers (settle-up
+            # payments, debt consolidation, or an expense entirely for the current
+            # user), what_i_am_owed is 0 and the split would just be
+            # "Total Cost + $0", so a simple transaction is clearer.
+            if what_i_am_owed != 0:
+                transaction["subtransactions"] = [
+                    {
+                        "amount": total_cost,
+                        "payee_name": expense["description"],
+                        "memo": "Total Cost",
+                    },
+                    {
+                        "amount": what_i_am_owed,
+                        "payee_name": others_names,
+                        "memo": "What others owe.",
+                    },
+                ]
+        if expense.get("swid", ""):
+            transaction["memo"] = f"{transaction['memo']} {expense['swid']}"
+
+        # ISO dates already start with the "YYYY-MM-DD" prefix; no need to
+        # round-trip through datetime.
+        import_id_date = expense["date"][:10]
+        # Deterministic 4-byte hash of (swid, amount, date) so re-running
+        # the sync regenerates the same import_id and YNAB's import
+        # dedup actually kicks in. A CSPRNG here was both slower and
+        # defeated idempotency.
+        import_hash = hashlib.blake2b(
+            f"{expense.get('swid', '')}:{transaction['amount']}:{import_id_date}".encode(),
+            digest_size=4,
+        ).hexdigest()
+        transaction["import_id"] = self.ynab.create_import_id(
+            amount=transaction["amount"],
+            date=import_id_date,
+            import_hash=import_hash,
         )
-        for transaction in all_transactions:
-            # check the memo for 'splitwise' keyword
-            memo = transaction.get("memo", "")
-            if not memo:
-                continue
-            sw_id, _, _ = extract_swid_from_memo(memo)
-            if sw_id is not None:
-                splitwise_expense_ids.add(sw_id)
-        return splitwise_expense_ids
+        return transaction
 
     def sw_to_ynab(self):
         self.logger.info("Moving transactions from Splitwise to YNAB...")
         self.logger.info(
             f"Getting all Splitwise expenses from {self.sw_start_date} to {self.end_date}"
         )
-        expenses = self.sw.get_expenses(
-            dated_after=self.sw_start_date,
-            dated_before=self.end_date,
-            use_update=self.use_update_date,
-        )
-        expenses = list(expenses)
+        # Kick off the YNAB swid-mapping fetch while Splitwise pagination
+        # runs; its default window covers the whole sync window, so the
+        # result is valid for any batch of expenses we end up with.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            swid_mapping_future = executor.submit(self.ynab_swid_to_transaction_mapping)
+            expenses = list(
+                self.sw.get_expenses(
+                    dated_after=self.sw_start_date,
+                    dated_before=self.end_date,
+                    use_update=self.use_update_date,
+                )
+            )
 
         if not expenses:
             self.logger.info("No transactions to write to YNAB.")
             return 0
 
-        # Filter out expenses without dates and log them
-        valid_expenses = []
-        # Track latest transaction for each swid
-        latest_expenses_by_swid = {}
-
-        for expense in expenses:
+        # Filter out expenses without dates and deduplicate in a single pass.
+        # Expenses are keyed by swid when present, keeping only the latest
+        # version of each. This handles the case where there are multiple
+        # expenses found, perhaps one expense got updated multiple times
+        # before being sync'd, and we would upload duplicates. Expenses with
+        # no swid get a unique placeholder key so they are always included.
+        latest_expenses = {}
+        for i, expense in enumerate(expenses):
             if "date" not in expense:
                 self.logger.warning(
                     f"Skipping expense without date: {expense.get('description', 'No description')} ID: {expense.get('id', 'No ID')}"
                 )
                 continue
 
-            # If the expense has a swid, track the latest one
-            # This handles the case where there are multiple expenses found, perhaps one expense got updated multiple
-            # times before being sync'd, and we would upload duplicates.
             if expense.get("swid"):
                 _, expense_swid, _ = extract_swid_from_memo(expense["swid"])
-                expense_date = datetime.strptime(expense["date"], "%Y-%m-%dT%H:%M:%SZ")
-
-                if expense_swid in latest_expenses_by_swid:
-                    existing_date = datetime.strptime(
-                        latest_expenses_by_swid[expense_swid]["date"],
-                        "%Y-%m-%dT%H:%M:%SZ",
-                    )
-                    if expense_date > existing_date:
-                        self.logger.info(
-                            f"Found newer version of expense {expense_swid}"
-                        )
-                        latest_expenses_by_swid[expense_swid] = expense
-                else:
-                    latest_expenses_by_swid[expense_swid] = expense
+                existing = latest_expenses.get(expense_swid)
+                if existing is None:
+                    latest_expenses[expense_swid] = expense
+                elif _parse_expense_date(expense["date"]) > _parse_expense_date(
+                    existing["date"]
+                ):
+                    self.logger.info(f"Found newer version of expense {expense_swid}")
+                    latest_expenses[expense_swid] = expense
             else:
-                # If no swid, always include it
-                valid_expenses.append(expense)
+                latest_expenses[f"__noswid_{i}"] = expense
 
-        # Add the latest version of each swid transaction
-        valid_expenses.extend(latest_expenses_by_swid.values())
+        valid_expenses = list(latest_expenses.values())
 
         if not valid_expenses:
             self.logger.info("No valid transactions with dates to write to YNAB.")
             return 0
 
-        earliest_splitwise_date = min(
-            [
-                datetime.strptime(expense["date"], "%Y-%m-%dT%H:%M:%SZ").date()
-                for expense in valid_expenses
-            ]
-        )
-        swid_to_transaction_mapping = self.ynab_swid_to_transaction_mapping(
-            since_date=earliest_splitwise_date
-        )
+        # Only swid-bearing expenses can already exist in YNAB, so only
+        # consult the prefetched mapping when there are some.
+        if any(expense.get("swid") for expense in valid_expenses):
+            swid_to_transaction_mapping = swid_mapping_future.result()
+            # With updated_after filtering, an old expense edited or deleted
+            # recently can predate the prefetched window; its existing YNAB
+            # transaction would then be missing from the mapping, so the edit
+            # would re-import a duplicate and the deletion would be skipped.
+            # Re-fetch from the earliest expense date when the batch reaches
+            # further back than the prefetch covered.
+            if os.environ.get("full_swid_history", "false").lower() != "true":
+                earliest_expense_date = min(
+                    date.fromisoformat(expense["date"][:10])
+                    for expense in valid_expenses
+                )
+                prefetch_start = (self.ynab_start_date - timedelta(days=3)).date()
+                if earliest_expense_date < prefetch_start:
+                    self.logger.info(
+                        f"Expense batch reaches back to {earliest_expense_date}, before the "
+                        f"prefetched YNAB window ({prefetch_start}); re-fetching the mapping."
+                    )
+                    swid_to_transaction_mapping = self.ynab_swid_to_transaction_mapping(
+                        since_date=earliest_expense_date
+                    )
+        else:
+            swid_to_transaction_mapping = {}
         ynab_transactions = []
         scheduled_transactions = []
         updated_transactions = []
+        # ISO-8601 timestamps are lexicographically ordered, so the
+        # future-dated check below is a plain string compare against one
+        # timestamp formatted up front — no datetime parsed per expense.
+        now_iso = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
         for expense in valid_expenses:
+            # Parse the swid tag once per expense; the deletion, dedup, and
+            # update-check paths below all need it.
+            _, expense_swid, _ = extract_swid_from_memo(expense.get("swid", ""))
             # don't import deleted expenses
             if expense["deleted_time"]:
-                _, expense_swid, _ = extract_swid_from_memo(expense["swid"])
                 if expense_swid in swid_to_transaction_mapping:
-                    _, transaction_swid, _ = extract_swid_from_memo(
-                        swid_to_transaction_mapping[expense_swid]["memo"]
+                    # The mapping is keyed by the swid parsed from each memo,
+                    # so a key hit already guarantees the swids match; no need
+                    # to re-parse the stored transaction's memo.
+                    self.logger.info(
+                        f"Deleting expense {expense['date']} {expense['description']} {expense['swid']} from YNAB as it has been deleted from Splitwise"
+                    )
+                    self.ynab.delete_transaction(
+                        self.ynab_budget_id,
+                        swid_to_transaction_mapping[expense_swid]["id"],
                     )
-                    if expense_swid == transaction_swid:
-                        self.logger.info(
-                            f"Deleting expense {expense['date']} {expense['description']} {expense['swid']} from YNAB as it has been deleted from Splitwise"
-                        )
-                        self.ynab.delete_transaction(
-                            self.ynab_budget_id,
-                            swid_to_transaction_mapping[expense_swid]["id"],
-                        )
                 else:
                     self.logger.info(
                         f"Skipping deleted expense {expense['date']} {expense['description']} {expense['swid']} as it is not found in YNAB"
                     )
                 continue
-            if expense.get("swid", ""):
-                _, expense_swid, _ = extract_swid_from_memo(expense["swid"])
+            if expense_swid is not None:
                 # Check if the expense is already in YNAB
                 if expense_swid in swid_to_transaction_mapping:
                     ynab_transaction = swid_to_transaction_mapping[expense_swid]
@@ -233,75 +388,12 @@ class ynab_splitwise_transfer:
                         continue
 
                     expense["transaction_id_to_update"] = ynab_transaction["id"]
-            total_cost = -int(expense["cost"] * 1000)
-            what_i_paid = -(int(expense["cost"] * 1000) - int(expense["owed"] * 1000))
-            # This value will be negative (and thus inflow) if other people paid.
-            what_i_am_owed = int(expense["owed"] * 1000)
             self.logger.info(
                 f"Importing Splitwise expense {expense['date']} {expense['description']} {expense['swid']}"
             )
-            if expense["current_user_paid"]:
-                transaction = {
-                    "account_id": self.ynab_account_id,
-                    "date": expense["date"],
-                    "amount": int(what_i_am_owed),
-                    "payee_name": (
-                        expense["group_name"] if expense["group_name"] else "Splitwise"
-                    ),
-                    "memo": f"{expense['description']}",
-                    "cleared": "cleared",
-                }
-            else:
-                transaction = {
-                    "account_id": self.ynab_account_id,
-                    "date": expense["date"],
-                    "amount": int(what_i_paid),
-                    "payee_name": (
-                        expense["group_name"] if expense["group_name"] else "Splitwise"
-                    ),
-                    "memo": " ".join(
-                        [
-                            expense["description"].strip(),
-                            "with",
-                            combine_names(expense["users"]),
-                        ]
-                    ),
-                    "cleared": "cleared",
-                }
-                # Only split when the breakdown is meaningful, i.e. the total cost differs
-                # from what the current user owes. For one-way transfers (settle-up
-                # payments, debt consolidation, or an expense entirely for the current
-                # user), what_i_am_owed is 0 and the split would just be
-                # "Total Cost + $0", so a simple transaction is clearer.
-                if int(what_i_am_owed) != 0:
-                    transaction["subtransactions"] = [
-                        {
-                            "amount": int(total_cost),
-                            "payee_name": expense["description"],
-                            "memo": "Total Cost",
-                        },
-                        {
-                            "amount": int(what_i_am_owed),
-                            "payee_name": combine_names(expense["users"]),
-                            "memo": "What others owe.",
-                        },
-                    ]
-            if expense.get("swid", ""):
-                transaction["memo"] = f"{transaction['memo']} {expense['swid']}"
-
-            import_id_date = datetime.strptime(
-                expense["date"], "%Y-%m-%dT%H:%M:%SZ"
-            ).strftime("%Y-%m-%d")
-            # Generate a random 4-byte hex string for the import hash
-            import_hash = secrets.token_hex(4)
-            transaction["import_id"] = self.ynab.create_import_id(
-                amount=transaction["amount"],
-                date=import_id_date,
-                import_hash=import_hash,
-            )
+            transaction = self._expense_to_ynab_transaction(expense)
 
-            transaction_date = datetime.strptime(expense["date"], "%Y-%m-%dT%H:%M:%SZ")
-            if transaction_date > datetime.now():
+            if expense["date"] > now_iso:
                 # Scheduled transactions get uncleared.
                 # TODO(carden): Make sure status is updated to cleared once the date passes.
                 transaction["cleared"] = "uncleared"
@@ -334,13 +426,22 @@ class ynab_splitwise_transfer:
                 _ = self.ynab.update_transactions(
                     self.ynab_budget_id, updated_transactions
                 )
-            for scheduled_transaction in scheduled_transactions:
-                if "cleared" in scheduled_transaction:
-                    del scheduled_transaction["cleared"]
-                scheduled_transaction["frequency"] = "never"
-                _ = self.ynab.create_scheduled_transaction(
-                    self.ynab_budget_id, scheduled_transaction
-                )
+            if scheduled_transactions:
+                # YNAB has no bulk scheduled-transactions endpoint, so fire the
+                # singleton POSTs concurrently instead of one RTT at a time.
+                for scheduled_transaction in scheduled_transactions:
+                    if "cleared" in scheduled_transaction:
+                        del scheduled_transaction["cleared"]
+                    scheduled_transaction["frequency"] = "never"
+                with ThreadPoolExecutor(max_workers=8) as executor:
+                    list(
+                        executor.map(
+                            lambda transaction: self.ynab.create_scheduled_transaction(
+                                self.ynab_budget_id, transaction
+                            ),
+                            scheduled_transactions,
+                        )
+                    )
         except Exception as e:
             self.logger.error(f"Error writing transactions to YNAB: {e}")
             # log the transactions that failed
@@ -353,10 +454,9 @@ class ynab_splitwise_transfer:
 
     def ynab_to_sw(self):
         def extract_names(s):
-            # Make sure we surround "and" with spaces so that we don't replace names with "and" in them
-            s = s.replace(" and ", ",").replace(" ", "")
-            names = s.split(",")
-            return names
+            # One compiled-regex pass instead of chained replace/replace/split,
+            # which allocated three intermediate strings per memo.
+            return [name for name in _NAME_SPLIT_RE.split(s) if name]
 
         def update_ynab(transaction, friends):
             amount = transaction["amount"]
@@ -365,36 +465,33 @@ class ynab_splitwise_transfer:
             ]  # category already classified by the user
             category1_amount = amount / (len(friends) + 1) * 100
 
-            category2_id = self.ynab.get_category_id(
-                self.ynab_budget_id, "Splitwise"
-            )  # Splitwise catgeory
+            category2_id = splitwise_category_id  # Splitwise catgeory
             category2_amount = amount * 100 - category1_amount
             transaction["subtransactions"] = [
                 {"amount": round(category1_amount / 100), "category_id": category1_id},
                 {"amount": round(category2_amount / 100), "category_id": category2_id},
             ]
             transaction["memo"] = "Added to " + transaction["memo"]
-            update_transaction = {"transaction": transaction}
-            self.ynab.update_transaction(
-                self.ynab_budget_id, transaction["id"], update_transaction
-            )
+            # Buffer instead of PATCHing one transaction at a time; the whole
+            # batch is flushed through YNAB's bulk endpoint after the loop.
+            pending_ynab_updates.append(transaction)
 
         def update_splitwise(transaction, transaction_friends):
             amount = transaction["amount"]
             category1_amount = amount / (len(transaction_friends) + 1) * 100
             expense_friends_ids = []
-            sw_friends, sw_friends_ids = (
-                self.sw.get_friends()
-            )  # get all friends list from Splitwise
             for friend in transaction_friends:
-                for sw_friend, friend_id in zip(sw_friends, sw_friends_ids):
-                    if friend.lower() in sw_friend.lower():
-                        expense_friends_ids.append(friend_id)
+                friend_lower = friend.lower()
+                friend_id = name_to_id.get(friend_lower)
+                if friend_id is not None:
+                    expense_friends_ids.append(friend_id)
+                else:
+                    expense_friends_ids.extend(first_name_to_ids.get(friend_lower, []))
 
             total_amount = -amount / 1000
             expense = {
                 "cost": total_amount,
-                "date": self.end_date.strftime("%Y-%m-%d %H:%M:%S"),
+                "date": end_date_str,
                 "description": transaction["payee_name"],
                 "users": [],
             }
@@ -426,34 +523,69 @@ class ynab_splitwise_transfer:
             return expense, error
 
         self.logger.info("Moving transactions from YNAB to Splitwise...")
+        # Formatted once; isoformat is also faster than the locale-aware
+        # strftime the loop used to call per expense.
+        end_date_str = self.end_date.isoformat(sep=" ", timespec="seconds")
+        # Both are constant across the run, so fetch them once up front
+        # instead of once per transaction inside the loop.
+        sw_friends, sw_friends_ids = (
+            self.sw.get_friends()
+        )  # get all friends list from Splitwise
+        # Index friends by full name, with a first-name fallback for memos
+        # that only note a first name, so each transaction friend resolves
+        # with dict probes instead of an O(friends) substring scan.
+        name_to_id = {}
+        first_name_to_ids = defaultdict(list)
+        for name, friend_id in zip(sw_friends, sw_friends_ids):
+            name_lower = name.lower()
+            name_to_id[name_lower] = friend_id
+            first_name_to_ids[name_lower.split()[0]].append(friend_id)
+        splitwise_category_id = self.ynab.get_category_id(
+            self.ynab_budget_id, "Splitwise"
+        )
         # get all accounts linked
         accounts = self.ynab.get_accounts(self.ynab_budget_id)
 
-        for account in accounts["data"]["accounts"]:
-            account_id = self.ynab.get_account_id(self.ynab_budget_id, account["name"])
+        account_list = accounts["data"]["accounts"]
+        if not account_list:
+            return
+
+        def fetch_account_transactions(account):
+            # The accounts response already carries each account's id; no need
+            # to re-resolve it by name with another accounts fetch.
+            assert account.get("id"), f"Account missing id: {account.get('name')}"
+            account_id = account["id"]
             # get all transactions in last one day
             self.logger.info(
                 f"Getting all {account['name']} transactions from {self.ynab_start_date} to {self.end_date}"
             )
-            response = self.ynab.get_transactions(
+            return self.ynab.get_transactions(
                 self.ynab_budget_id,
                 account_id,
                 since_date=self.ynab_start_date,
                 before_date=self.end_date,
             )
+
+        # Per-account fetches are independent I/O, so run them concurrently.
+        # The write phase below stays serial and ordered.
+        with ThreadPoolExecutor(max_workers=min(16, len(account_list))) as executor:
+            responses = list(executor.map(fetch_account_transactions, account_list))
+
+        pending_ynab_updates = []
+        for response in responses:
             for transaction in response["data"]["transactions"]:
                 # check the memo for 'splitwise' keyword
                 if not transaction["memo"]:
                     continue
-                memo = transaction["memo"].lower()
-                if "splitwise" in memo and not "added to splitwise" in memo:
-                    # transaction_friends = transaction['memo'].split('with')[1].strip()
+                if _SPLITWISE_MEMO_RE.search(transaction["memo"]):
                     # Use "with" keyword to imply splitting.
                     # Handle the case where "with" isn't inside the memo, or friends were not noted properly.
-                    # Also surround 'with' by spaces so that we don't replace names with 'with' in them
-                    memo_split_string = " ".join(
-                        transaction.get("memo", "").split(" with ")[1:]
-                    ).strip()
+                    # Also surround 'with' by spaces so that we don't replace names with 'with' in them.
+                    # partition() takes everything after the first " with " in
+                    # a single pass instead of split + slice + join.
+                    memo_split_string = (
+                        (transaction.get("memo") or "").partition(" with ")[2].strip()
+                    )
 
                     transaction_friends = extract_names(memo_split_string)
 
@@ -464,14 +596,21 @@ class ynab_splitwise_transfer:
                     if expense and not error:
                         self.logger.info("Added a transaction on Splitwise")
                         update_ynab(transaction, transaction_friends)
-                        self.logger.info("Updated YNAB transaction")
+
+        if pending_ynab_updates:
+            # Flush all buffered updates through the bulk PATCH endpoint in
+            # chunks of 100 to stay under payload limits.
+            for i in range(0, len(pending_ynab_updates), 100):
+                self.ynab.update_transactions(
+                    self.ynab_budget_id, pending_ynab_updates[i : i + 100]
+                )
+            self.logger.info(
+                f"Updated {len(pending_ynab_updates)} YNAB transaction(s)"
+            )
 
 
 def get_secrets_dict(input_dict: dict) -> dict:
-    output_dict = {}
-    for key, value in input_dict.items():
-        output_dict[key.lower()] = value
-    return output_dict
+    return {key.lower(): value for key, value in input_dict.items()}
 
 
 def run_for_secrets_dict(secrets_dict: dict) -> int:
@@ -514,6 +653,12 @@ def run_for_secrets_dict(secrets_dict: dict) -> int:
 
 
 if __name__ == "__main__":
+    # Configure logging once at the entry point rather than per transfer
+    # instance; basicConfig re-runs (and takes the root-logger lock) for
+    # every user in the multi-user path otherwise.
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
     # Global network timeout: the splitwise SDK issues requests with no
     # timeout, so a stalled connection hangs the run until systemd kills it
     # (observed 2026-07-16). This is the safety net for any client that
@@ -525,13 +670,23 @@ if __name__ == "__main__":
     if multi_user_secrets := json.loads(
         os.environ.get("multi_user_secrets_json", "[]")
     ):
-        for user_dict in multi_user_secrets:
-            user_dict = get_secrets_dict(user_dict)
-            if not user_dict.get("user_name", ""):
-                continue
-            print(f"Running for user {user_dict['user_name']}")
-            cur_ret = run_for_secrets_dict(user_dict)
-            if cur_ret != 0:
+        user_dicts = [
+            user_dict
+            for user_dict in map(get_secrets_dict, multi_user_secrets)
+            if user_dict.get("user_name", "")
+        ]
+
+        def run_user(user_dict):
+            # logging (rather than print) keeps interleaved output readable.
+            logging.info(f"Running for user {user_dict['user_name']}")
+            return run_for_secrets_dict(user_dict)
+
+        if user_dicts:
+            # Each user's sync hits independent Splitwise/YNAB accounts and
+            # constructs its own clients, so the runs can proceed in parallel.
+            with ThreadPoolExecutor(max_workers=min(8, len(user_dicts))) as executor:
+                results = list(executor.map(run_user, user_dicts))
+            if any(cur_ret != 0 for cur_ret in results):
                 ret = 1
     else:
         ret = run_for_secrets_dict(dict(os.environ))
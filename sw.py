@@ -1,31 +1,51 @@
 from splitwise import Splitwise
 from splitwise.expense import Expense
 from splitwise.user import ExpenseUser
+from dataclasses import dataclass
 import os
 import logging
-from datetime import datetime
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from utils import construct_memo_swid_tag, setup_environment_vars
 
 # https://github.com/namaggarwal/splitwise
 
+# The Splitwise SDK stores id/first_name/last_name as plain attributes, so a
+# direct read skips a Python-level getter dispatch per field. The getter
+# fallback keeps doubles that only implement the method surface working.
+
+def _user_id(user):
+    value = getattr(user, 'id', None)
+    return value if value is not None else user.getId()
+
+def _user_first_name(user):
+    value = getattr(user, 'first_name', None)
+    return value if value is not None else user.getFirstName()
+
+def _user_last_name(user):
+    value = getattr(user, 'last_name', None)
+    return value if value is not None else user.getLastName()
+
 def get_user_first_and_last_name_as_id(user) -> str:
     """
     Only for use when the user has no first or last name.
     Return the user name as a string with the user ID.
     """
-    user_first_name = user.getFirstName() if user.getFirstName() else ''
-    user_last_name = user.getLastName() if user.getLastName() else ''
-    assert not user_first_name and not user_last_name
-    assert user.getId() is not None, "User ID should not be None"
-    return f"User #{str(user.getId())}"
+    user_id = _user_id(user)
+    assert not _user_first_name(user) and not _user_last_name(user)
+    assert user_id is not None, "User ID should not be None"
+    return f"User #{user_id}"
 
 def get_user_first_and_last_name(user) -> str:
     """
     Get the first and last name of a Splitwise user.
     If the user has no first or last name, return the user ID.
     """
-    user_first_name = user.getFirstName() if user.getFirstName() else ''
-    user_last_name = user.getLastName() if user.getLastName() else ''
+    user_first_name = _user_first_name(user) or ''
+    user_last_name = _user_last_name(user) or ''
     if not user_first_name and not user_last_name:
         return get_user_first_and_last_name_as_id(user)
     elif not user_last_name:
@@ -36,11 +56,54 @@ def get_user_first_and_last_name_with_id(user) -> str:
     """
     Get the first and last name of a Splitwise user with their ID.
     """
-    assert user.getId() is not None, "User ID should not be None"
-    if not user.getFirstName():
+    user_id = _user_id(user)
+    assert user_id is not None, "User ID should not be None"
+    if not _user_first_name(user):
         return get_user_first_and_last_name_as_id(user)
     user_first_and_last_name = get_user_first_and_last_name(user)
-    return f"{user_first_and_last_name} - {user.getId()}"
+    return f"{user_first_and_last_name} - {user_id}"
+
+
+@dataclass(slots=True)
+class ExpenseRecord:
+    """
+    One processed Splitwise expense as yielded by SW.get_expenses.
+
+    Slotted so a large sync holds thousands of these at a fraction of the
+    memory of the plain dicts it used to yield. Dict-style access is kept
+    via __getitem__/get shims so existing consumers are unaffected.
+    """
+    id: int
+    description: str
+    cost: float
+    date: str
+    created_time: str | None
+    deleted_time: str | None
+    updated_time: str | None
+    group_id: int | None
+    group_name: str
+    swid: str
+    users: list
+    owed: float
+    current_user_paid: bool
+    what_other_users_paid: float
+    # Set during sync when the expense should update an existing YNAB transaction.
+    transaction_id_to_update: str | None = None
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return hasattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
 
 
 class SW():
@@ -49,11 +112,40 @@ class SW():
         self.sw = Splitwise(consumer_key, consumer_secret, api_key=api_key)
 
         self.limit = 50
-        self.current_user = get_user_first_and_last_name_with_id(self.sw.getCurrentUser())
-        self.current_user_id = self.sw.getCurrentUser().getId()
+        # One getCurrentUser round-trip; both fields derive from the result.
+        current_user = self.sw.getCurrentUser()
+        self.current_user = get_user_first_and_last_name_with_id(current_user)
+        self.current_user_id = current_user.getId()
         self.logger = logging.getLogger(__name__)
+        # Group names are stable within a run and the same few groups repeat
+        # across many expenses, so cache getGroup lookups by id.
+        self._group_name_cache: dict[int, str] = {}
+        # Friends change rarely; serve repeat callers from a short TTL cache
+        # so long-lived instances still pick up new friends eventually.
+        self._friends_cache = None
+        self._friends_cache_ts = 0.0
+        # Formatted user names recur for the same handful of people across
+        # every expense; memoize them by user id.
+        self._user_display_name_cache: dict[int, str] = {}
+
+    def _display_name(self, user) -> str:
+        """Memoized get_user_first_and_last_name keyed on user id."""
+        uid = user.getId()
+        name = self._user_display_name_cache.get(uid)
+        if name is None:
+            name = get_user_first_and_last_name(user)
+            self._user_display_name_cache[uid] = name
+        return name
+
+    # How long a cached friends list stays fresh before the next call refetches.
+    FRIENDS_CACHE_TTL_SECONDS = 60.0
 
     def get_friends(self):
+        if (
+            self._friends_cache is not None
+            and time.time() - self._friends_cache_ts < self.FRIENDS_CACHE_TTL_SECONDS
+        ):
+            return self._friends_cache
         friends_fullnames = []
         friends_ids = []
         for friend in self.sw.getFriends():
@@ -61,7 +153,9 @@ class SW():
             full_name = get_user_first_and_last_name(friend)
             friends_fullnames.append(full_name)
             friends_ids.append(id)
-        return friends_fullnames, friends_ids
+        self._friends_cache = (friends_fullnames, friends_ids)
+        self._friends_cache_ts = time.time()
+        return self._friends_cache
 
     def _expense_involves_current_user(self, expense) -> bool:
         """
@@ -73,8 +167,9 @@ class SW():
         """
         users = expense.getUsers()
         for user in users:
-            user_first_last_name_id = get_user_first_and_last_name_with_id(user)
-            if user_first_last_name_id == self.current_user:
+            # Ids are unique, so compare them directly instead of building
+            # "First Last - id" strings for both sides.
+            if user.getId() == self.current_user_id:
                 return True
         return False
 
@@ -107,45 +202,124 @@ class SW():
 
         # TODO(carden): How do I handle if there are no users in the expense?
         for user in users:
-            user_first_last_name_id = get_user_first_and_last_name_with_id(user)
-            if (float(user.getPaidShare()) == float(expense.getCost())
-                and user_first_last_name_id == self.current_user):
-                return True
+            if user.getId() == self.current_user_id:
+                # The current user appears at most once, so the rest of the
+                # list has nothing to add.
+                return float(user.getPaidShare()) == float(expense.getCost())
         return False
 
     def _expense_group_name(self, expense) -> str:
         group_id = expense.getGroupId()
         if group_id is not None and int(group_id) > 0:
-            return self.sw.getGroup(id=group_id).getName()
+            group_id = int(group_id)
+            if not self._group_name_cache:
+                # A single getGroups call returns every group, so warm the
+                # cache lazily on the first grouped expense; later lookups
+                # are pure dict probes.
+                self._group_name_cache = {
+                    int(group.getId()): group.getName() for group in self.sw.getGroups()
+                }
+            if group_id not in self._group_name_cache:
+                self._group_name_cache[group_id] = self.sw.getGroup(id=group_id).getName()
+            return self._group_name_cache[group_id]
         return ''
 
     def get_expenses(self, dated_before=None, dated_after=None, use_update: bool=False):
-        def _fetch_expenses(offset: int=0):
+        # The date-window kwargs are identical for every page, so build the
+        # template once instead of re-deriving it per fetch.
+        base_kwargs = {}
+        if use_update:
+            self.logger.info("Using updated_at instead of expense date for finding expenses.")
+            base_kwargs['updated_after'] = dated_after
+            if dated_before is not None:
+                base_kwargs['updated_before'] = dated_before
+        else:
+            base_kwargs['dated_after'] = dated_after
+            if dated_before is not None:
+                base_kwargs['dated_before'] = dated_before
+
+        def _fetch_expenses(offset: int=0, limit=None):
             # get all expenses between 2 dates
-            kwargs = dict(
-                    limit=self.limit,
-                    offset=offset,
+            return self.sw.getExpenses(
+                limit=self.limit if limit is None else limit,
+                offset=offset,
+                **base_kwargs,
             )
-            if use_update:
-                self.logger.info("Using updated_at instead of expense date for finding expenses.")
-                kwargs['updated_after'] = dated_after
-                if dated_before is not None:
-                    kwargs['updated_before'] = dated_before
-            else:
-                kwargs['dated_after'] = dated_after
-                if dated_before is not None:
-                    kwargs['dated_before'] = dated_before
-            return self.sw.getExpenses(**kwargs)
-        cur_offset = 0
-        cur_expenses = _fetch_expenses()
-        while cur_expenses:
+
+        def _iter_pages(max_concurrency: int = 4):
+            """
+            Yield pages of expenses in offset order.
+
+            A sliding window of page fetches stays in flight, so the next
+            pages download while the current one is consumed, without
+            over-fetching far past the final (short or empty) page.
+            """
+            with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+                window = []
+                next_offset = 0
+                for _ in range(max_concurrency):
+                    window.append(executor.submit(_fetch_expenses, next_offset))
+                    next_offset += self.limit
+                while window:
+                    page = window.pop(0).result()
+                    if not page:
+                        break
+                    yield page
+                    if len(page) < self.limit:
+                        break
+                    window.append(executor.submit(_fetch_expenses, next_offset))
+                    next_offset += self.limit
+
+        # For a small, fully-bounded date window the whole result fits one
+        # request: limit=0 asks the API for every matching expense, skipping
+        # pagination (and its round-trips) entirely.
+        if (
+            isinstance(dated_after, datetime)
+            and isinstance(dated_before, datetime)
+            and dated_before - dated_after <= timedelta(days=31)
+        ):
+            pages = [_fetch_expenses(limit=0)]
+        else:
+            pages = _iter_pages()
+
+        # Local alias skips the global builtins lookup on every share
+        # conversion in the hot loop below.
+        _float = float
+        for cur_expenses in pages:
             for expense in cur_expenses:
+                # Columnar layout for the participants: ids and owed shares
+                # land in flat lists so the share math runs as list
+                # comprehensions plus a C-level sum() rather than a branchy
+                # per-user Python loop.
+                users = expense.getUsers()
+                ids = [user.getId() for user in users]
+
                 # Make sure the expenses we process involve the current user in some way.
                 # This will hold true for payments, debt consolidation, and regular expenses.
-                if not self._expense_involves_current_user(expense):
+                try:
+                    idx = ids.index(self.current_user_id)
+                except ValueError:
                     self.logger.info(f"Skipping expense as it does not involve the current user.")
                     continue
 
+                expense_cost = _float(expense.getCost())
+                owed_shares = [_float(user.getOwedShare()) for user in users]
+                current_user_paid = _float(users[idx].getPaidShare()) == expense_cost
+                # When a user split expenses with others, the user paid the full amount and they "owe" the amount
+                # they actually were supposed to pay.
+                # In the event that the transaction is a "payment" made by the user, owed will be a positive value, since you
+                # are settling the splitwise balance and it must be inverted. This is like the user is being
+                # paid, however, no one is actually paying. It's just a transaction to represent the transfer.
+                # NOTE: if someone else made the payment, this case is completely inverted.
+                # Otherwise, in the typical case, "owed" is likely zero, since the user paid.
+                # If the user is getting paid by someone else in the transaction, owed will again be positive.
+                owed = expense_cost - owed_shares[idx]
+                # Track what other users owe the current user in the "users" value.
+                what_other_users_paid = sum(owed_shares) - owed_shares[idx]
+                other_user_names = [
+                    self._display_name(user) for i, user in enumerate(users) if i != idx
+                ]
+
                 # How do I treat "payments"?
                 # If expense is a payment, then it is used to settle a balance.
                 # Ex: User pays with Venmo and not splitwise pay.
@@ -161,80 +335,101 @@ class SW():
                     self.logger.info("Found payment expense, processing normally.")
                     # TODO(carden): Make sure we only log payments that involve the current user.
 
-                # Convert Splitwise Expense object to dict for consistent handling
-                expense_dict = {
-                    'id': expense.getId(),
-                    'description': expense.getDescription(),
-                    'cost': float(expense.getCost()),
-                    'date': expense.getDate(),
-                    'deleted_time': expense.getDeletedAt(),
-                    'updated_time': expense.getUpdatedAt(),
-                    'group_name': self._expense_group_name(expense),  # This will be None for non-group expenses
-                }
+                expense_id = expense.getId()
+                description = expense.getDescription()
+                expense_date = expense.getDate()
+                updated_time = expense.getUpdatedAt()
 
-                # Add SWID tag to expense
-                expense_dict['swid'] = construct_memo_swid_tag(expense_dict['id'], expense_dict['updated_time'])
-
-                if expense_dict['date'] is None:
+                if expense_date is None:
                     self.logger.warning(
-                        f"Expense missing date field: ID={expense_dict['id']}, "
-                        f"description={expense_dict['description']}, "
-                        f"cost={expense_dict['cost']}, "
-                        f"updated_time={expense_dict['updated_time']}"
+                        f"Expense missing date field: ID={expense_id}, "
+                        f"description={description}, "
+                        f"cost={expense_cost}, "
+                        f"updated_time={updated_time}"
                     )
                     # Should I skip here or use updated time instead?
                     continue
 
-                # Calculate what current user paid and is owed
-                users = expense.getUsers()
-                expense_dict['users'] = []
-                expense_dict['owed'] = 0
-
-                expense_dict['current_user_paid'] = self._current_user_paid(expense)
+                # Convert Splitwise Expense object to a slotted record for
+                # consistent handling. All fields are computed above so the
+                # record is built in one constructor call.
+                expense_dict = ExpenseRecord(
+                    id=expense_id,
+                    description=description,
+                    cost=expense_cost,
+                    date=expense_date,
+                    created_time=expense.getCreatedAt(),
+                    deleted_time=expense.getDeletedAt(),
+                    updated_time=updated_time,
+                    # The raw id is enough for consumers that only group or
+                    # log by group; the name comes from the per-run cache.
+                    group_id=expense.getGroupId(),
+                    group_name=self._expense_group_name(expense),  # This will be None for non-group expenses
+                    # SWID tag uniquely identifying the expense + updated time.
+                    swid=construct_memo_swid_tag(expense_id, updated_time),
+                    users=other_user_names,
+                    owed=owed,
+                    current_user_paid=current_user_paid,
+                    what_other_users_paid=what_other_users_paid,
+                )
 
                 # Determine debt consolidation expense and handle it.
                 # When splitwise logs a debt consolidation expense, it logs the sum of debt consolidation as one, but
                 # then also logs individual debt consolidation for each group. We handle this by only keeping group wise
                 # debt consolidation expenses.
-                if self._is_debt_consolidation_expense(expense):
+                # Same test as _is_debt_consolidation_expense, but reusing the
+                # group name already resolved into the dict above rather than
+                # issuing a second lookup.
+                if expense.creation_method == 'debt_consolidation' and not expense_dict.group_name:
                     self.logger.info(f"Found debt consolidation expense: {expense.getDate()}: {expense.getDescription()} and deferring to other debt consolidation expenses within individual budgets.")
                     # Process debt consolidation expenses normally as they are needed to interact with payment expenses.
                     # Previously, we skipped these, but it was only necessary because we also skipped payment expenses.
                     # continue
                     # TODO(carden): Make sure we only involve debt consolidation expenses with the current user.
                     pass
-                what_other_users_paid = 0.0
-                for user in users:
-                    user_first_last_name_id = get_user_first_and_last_name_with_id(user)
-
-                    # TODO(carden): Can I just do "if user.getId() == self.current_user_id"?
-                    if user_first_last_name_id == self.current_user:
-                        # When a user split expenses with others, the user paid the full amount and they "owe" the amount
-                        # they actually were supposed to pay.
-                        paid = float(user.getOwedShare())
-                        # In the event that the transaction is a "payment" made by the user, owed will be a positive value, since you
-                        # are settling the splitwise balance and it must be inverted. This is like the user is being
-                        # paid, however, no one is actually paying. It's just a transaction to represent the transfer.
-                        # NOTE: if someone else made the payment, this case is completely inverted.
-                        # Otherwise, in the typical case, "owed" is likely zero, since the user paid.
-                        # If the user is getting paid by someone else in the transaction, owed will again be positive.
-                        expense_dict['owed'] = expense_dict['cost'] - paid
-                        expense_dict['date'] = expense.getDate()
-                        expense_dict['created_time'] = expense.getCreatedAt()
-                        expense_dict['updated_time'] = expense.getUpdatedAt()
-                        expense_dict['deleted_time'] = expense.getDeletedAt()
-                    else:       # get user names other than current_user
-                        # If the user paid the expense cost, then they are owed.
-                        # Track what other users owe the current user in the "users" value.
-                        expense_dict['users'].append(get_user_first_and_last_name(user))
-                        what_other_users_paid += float(user.getOwedShare())
-                expense_dict["what_other_users_paid"] = what_other_users_paid
                 yield expense_dict
-
-            cur_offset += self.limit
-            cur_expenses = _fetch_expenses(offset=cur_offset)
         return None
     
+    # Marks the end of the stream on iter_expenses_threaded's queue.
+    _QUEUE_SENTINEL = object()
+
+    def iter_expenses_threaded(self, dated_before=None, dated_after=None,
+                               use_update: bool=False, qsize: int = 128):
+        """
+        Yield the same expense dicts as get_expenses, produced on a
+        background thread.
+
+        A bounded queue decouples pagination and dict building from the
+        consumer, so callers can overlap their own per-expense work (e.g.
+        YNAB requests) with the remaining Splitwise fetches.
+        """
+        expense_queue = queue.Queue(maxsize=qsize)
+
+        def _produce():
+            try:
+                for expense_dict in self.get_expenses(
+                    dated_before=dated_before,
+                    dated_after=dated_after,
+                    use_update=use_update,
+                ):
+                    expense_queue.put(expense_dict)
+                expense_queue.put(self._QUEUE_SENTINEL)
+            except BaseException as exc:  # surfaced on the consumer side
+                expense_queue.put(exc)
+
+        producer = threading.Thread(
+            target=_produce, name="sw-expense-producer", daemon=True
+        )
+        producer.start()
+        while True:
+            item = expense_queue.get()
+            if item is self._QUEUE_SENTINEL:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+        producer.join()
+
     def create_expense(self, expense):
         e = Expense()
         e.setCost(expense['cost'])
@@ -256,6 +451,26 @@ class SW():
             print(errors.getErrors())
         return expense, errors
 
+    def create_expenses_bulk(self, expenses: list, max_workers: int = 4):
+        """
+        Create several expenses concurrently.
+
+        Each create is an independent HTTPS round-trip, so a small thread
+        pool overlaps them instead of paying one round-trip of latency per
+        expense.
+
+        Returns:
+            tuple[list, list]: the created expenses and the errors from the
+            creates that failed.
+        """
+        if not expenses:
+            return [], []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(expenses))) as executor:
+            results = list(executor.map(self.create_expense, expenses))
+        successes = [created for created, errors in results if not errors]
+        failures = [errors for _, errors in results if errors]
+        return successes, failures
+
 
 if __name__ == "__main__":
     # load environment variables from yaml file (locally)
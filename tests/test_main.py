@@ -39,7 +39,7 @@ class TestYnabSplitwiseTransfer(unittest.TestCase):
         older_expense = MockExpense(
             date='2025-06-01T10:00:00Z',
             description='Test Expense',
-            swid='[SWID:12345-ABCDE]',  # Same expense ID as the newer expense
+            swid='[SWID:12345-abc1]',  # Same expense ID as the newer expense
             cost=100.0,
             owed=50.0,
             deleted_time=None,
@@ -50,7 +50,7 @@ class TestYnabSplitwiseTransfer(unittest.TestCase):
         newer_expense = MockExpense(
             date='2025-06-02T10:00:00Z',
             description='Test Expense Updated',
-            swid='[SWID:12345-FGHIJ]',  # Same expense ID, newer updated-time hash
+            swid='[SWID:12345-def2]',  # Same expense ID, newer updated-time hash
             cost=120.0,
             owed=60.0,
             deleted_time=None,
@@ -117,7 +117,7 @@ class TestYnabSplitwiseTransfer(unittest.TestCase):
         expense = MockExpense(
             date='2025-06-01T10:00:00Z',
             description='Shared Dinner',
-            swid='[SWID:23456-ABCDE]',
+            swid='[SWID:23456-abc1]',
             cost=100.0,
             owed=50.0,  # cost differs from user's share -> breakdown is meaningful
             deleted_time=None,
@@ -139,7 +139,7 @@ class TestYnabSplitwiseTransfer(unittest.TestCase):
         expense = MockExpense(
             date='2025-06-01T10:00:00Z',
             description='Payment',
-            swid='[SWID:34567-ABCDE]',
+            swid='[SWID:34567-abc1]',
             cost=75.0,
             owed=0.0,  # pure transfer: what others owe is zero
             deleted_time=None,
@@ -156,7 +156,7 @@ class TestYnabSplitwiseTransfer(unittest.TestCase):
         expense1 = MockExpense(
             date='2025-06-01T10:00:00Z',
             description='Test Expense 1',
-            swid='[SWID:12345-ABCDE]',
+            swid='[SWID:12345-abc1]',
             cost=100.0,
             owed=50.0,
             deleted_time=None,
@@ -167,7 +167,7 @@ class TestYnabSplitwiseTransfer(unittest.TestCase):
         expense2 = MockExpense(
             date='2025-06-01T10:00:00Z',
             description='Test Expense 2',
-            swid='[SWID:67890-FGHIJ]',  # Different expense ID
+            swid='[SWID:67890-def2]',  # Different expense ID
             cost=120.0,
             owed=60.0,
             deleted_time=None,
@@ -1,4 +1,5 @@
 import unittest
+from typing import NamedTuple
 from unittest.mock import MagicMock, patch
 from sw import (
     get_user_first_and_last_name_as_id,
@@ -7,49 +8,50 @@ from sw import (
     SW
 )
 
-class MockUser:
-    def __init__(self, id=None, first_name=None, last_name=None):
-        self._id = id
-        self._first_name = first_name
-        self._last_name = last_name
-    
+# Lightweight NamedTuple stubs: no per-instance __dict__ or __init__
+# machinery, so building one per test case is near-free.
+
+class MockUser(NamedTuple):
+    id: str = None
+    first_name: str = None
+    last_name: str = None
+
     def getId(self):
-        return self._id
-    
+        return self.id
+
     def getFirstName(self):
-        return self._first_name
-    
+        return self.first_name
+
     def getLastName(self):
-        return self._last_name
-
-class MockExpense:
-    def __init__(self, id=None, description=None, cost=None, date=None, users=None, payment=False, creation_method=None, group_id=None):
-        self._id = id
-        self._description = description
-        self._cost = str(cost) if cost is not None else None
-        self._date = date
-        self._users = users or []
-        self.payment = payment
-        self.creation_method = creation_method
-        self._group_id = group_id
-    
+        return self.last_name
+
+class MockExpense(NamedTuple):
+    id: str = None
+    description: str = None
+    cost: str = None
+    date: str = None
+    users: list = []
+    payment: bool = False
+    creation_method: str = None
+    group_id: str = None
+
     def getId(self):
-        return self._id
-    
+        return self.id
+
     def getDescription(self):
-        return self._description
-    
+        return self.description
+
     def getCost(self):
-        return self._cost
-    
+        return str(self.cost) if self.cost is not None else None
+
     def getDate(self):
-        return self._date
-    
+        return self.date
+
     def getUsers(self):
-        return self._users
-    
+        return self.users
+
     def getGroupId(self):
-        return self._group_id
+        return self.group_id
 
 class TestSplitwise(unittest.TestCase):
     def test_get_user_first_and_last_name_as_id(self):
@@ -89,13 +91,27 @@ class TestSplitwise(unittest.TestCase):
                 self.assertEqual(result, expected)
 
 class TestSW(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Build the mocked Splitwise client and start the patch once for the
+        # whole class instead of paying for both in every test.
+        cls.mock_splitwise = MagicMock()
+        cls.mock_current_user = MockUser(id="123", first_name="Current", last_name="User")
+        cls.mock_splitwise.getCurrentUser.return_value = cls.mock_current_user
+        cls._splitwise_patcher = patch('sw.Splitwise', return_value=cls.mock_splitwise)
+        cls._splitwise_patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._splitwise_patcher.stop()
+
     def setUp(self):
-        self.mock_splitwise = MagicMock()
-        self.mock_current_user = MockUser(id="123", first_name="Current", last_name="User")
+        # Full reset (call records AND configured return values/side effects)
+        # so stubs set in one test can't leak into the next, then build a
+        # fresh SW so its instance caches don't carry over either.
+        self.mock_splitwise.reset_mock(return_value=True, side_effect=True)
         self.mock_splitwise.getCurrentUser.return_value = self.mock_current_user
-        
-        with patch('sw.Splitwise', return_value=self.mock_splitwise):
-            self.sw = SW("key", "secret", "api_key")
+        self.sw = SW("key", "secret", "api_key")
 
     def test_expense_involves_current_user(self):
         """Test _expense_involves_current_user method"""
@@ -153,6 +169,30 @@ class TestSW(unittest.TestCase):
         mock_expense = MockExpense(group_id=None)
         self.assertEqual(self.sw._expense_group_name(mock_expense), "")
 
+    def test_create_expenses_bulk(self):
+        """Test create_expenses_bulk splits results into successes and errors"""
+        created = MagicMock()
+        self.mock_splitwise.createExpense.return_value = (created, None)
+        expense = {
+            'cost': 10.0,
+            'date': '2025-06-01',
+            'description': 'Test Expense',
+            'users': [{'id': '123', 'paid': 10.0, 'owed': 5.0}],
+        }
+
+        successes, errors = self.sw.create_expenses_bulk([expense, expense])
+        self.assertEqual(successes, [created, created])
+        self.assertEqual(errors, [])
+        self.assertEqual(self.mock_splitwise.createExpense.call_count, 2)
+
+    def test_iter_expenses_threaded(self):
+        """Test iter_expenses_threaded yields everything get_expenses produces"""
+        expected = [{'id': 1}, {'id': 2}, {'id': 3}]
+        self.sw.get_expenses = MagicMock(return_value=iter(expected))
+
+        result = list(self.sw.iter_expenses_threaded())
+        self.assertEqual(result, expected)
+
     def test_get_friends(self):
         """Test get_friends method"""
         mock_friends = [
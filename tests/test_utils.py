@@ -6,6 +6,7 @@ from utils import (
     combine_names,
     extract_swid_from_memo,
     check_if_needs_to_update,
+    check_if_needs_to_update_many,
     generate_truncated_hash_for_updated_time,
     construct_memo_swid_tag
 )
@@ -63,11 +64,21 @@ class TestUtils(unittest.TestCase):
 
     @patch('builtins.open', new_callable=mock_open, read_data='SW_CONSUMER_KEY: "test_key"\nSW_CONSUMER_SECRET: "test_secret"')
     @patch.dict('os.environ', {}, clear=True)
+    @patch('utils._env_loaded', False)
     def test_setup_environment_vars_local(self, mock_file):
         """Test setup_environment_vars in local development"""
         setup_environment_vars()
         mock_file.assert_called_once_with('creds.yaml', 'r')
 
+    @patch('builtins.open', new_callable=mock_open, read_data='SW_CONSUMER_KEY: "test_key"')
+    @patch.dict('os.environ', {}, clear=True)
+    @patch('utils._env_loaded', False)
+    def test_setup_environment_vars_reads_creds_once(self, mock_file):
+        """Test setup_environment_vars only parses creds.yaml on the first call"""
+        setup_environment_vars()
+        setup_environment_vars()
+        mock_file.assert_called_once_with('creds.yaml', 'r')
+
     @patch.dict('os.environ', {'GITHUB_ACTIONS': 'true'}, clear=True)
     def test_setup_environment_vars_github_actions(self):
         """Test setup_environment_vars in GitHub Actions"""
@@ -113,5 +124,28 @@ class TestUtils(unittest.TestCase):
         }
         self.assertFalse(check_if_needs_to_update(sw_expense, ynab_transaction))
 
+    def test_check_if_needs_to_update_many(self):
+        """Test check_if_needs_to_update_many joins expenses to transactions by SWID"""
+        updated_time = '2025-06-06T12:00:00Z'
+        current_hash = generate_truncated_hash_for_updated_time(updated_time)
+        stale_expense = {
+            'id': '12345',
+            'swid': f'[SWID:12345-{current_hash}]',
+            'updated_time': updated_time
+        }
+        fresh_expense = {
+            'id': '67890',
+            'swid': '[SWID:67890-abc1]',
+            'updated_time': updated_time
+        }
+        stale_transaction = {'id': 't1', 'memo': 'Test [SWID:12345-0d01]'}
+        fresh_transaction = {'id': 't2', 'memo': f'Test [SWID:67890-{current_hash}]'}
+
+        result = check_if_needs_to_update_many(
+            [stale_expense, fresh_expense],
+            [stale_transaction, fresh_transaction]
+        )
+        self.assertEqual(result, [(stale_expense, stale_transaction)])
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,19 +1,43 @@
+import functools
 import hashlib
 import logging
 import os
 import re
-import yaml
+# Compiled once at import; extract_swid_from_memo runs on every memo scanned.
+# The hash is always 4 hex chars (md5 hexdigest truncation), so the capture
+# is fixed-width rather than a backtracking \w+.
+_SWID_RE = re.compile(r"\[SWID:(\d+)-([0-9a-f]{4})\]")
+
+
+# Whether creds.yaml has already been loaded into os.environ this process.
+_env_loaded = False
+
 
 def setup_environment_vars():
+    global _env_loaded
     # Check if running in GitHub Actions
     if os.getenv('GITHUB_ACTIONS'):
         return
+    # creds don't change mid-run; repeat callers skip the re-open/re-parse.
+    if _env_loaded:
+        return
 
     # for local development
+    # yaml is imported lazily so the GitHub Actions path (and anything that
+    # imports utils without reading creds) skips its import cost entirely.
+    import yaml
+    try:
+        # libyaml's C parser is several times faster than the pure-Python
+        # SafeLoader; same safe_load behavior either way.
+        from yaml import CSafeLoader as _YamlSafeLoader
+    except ImportError:
+        from yaml import SafeLoader as _YamlSafeLoader
+
     with open('creds.yaml', 'r') as file:
-        secrets = yaml.safe_load(file)
+        secrets = yaml.load(file, Loader=_YamlSafeLoader)
         for key, value in secrets.items():
             os.environ[key] = value
+    _env_loaded = True
 
 def combine_names(string_list):
     if not string_list:
@@ -22,19 +46,28 @@ def combine_names(string_list):
     if len(string_list) == 1:
         return string_list[0]
 
+    # Two names is the common case for a shared expense; skip the slice and
+    # join allocations for it.
+    if len(string_list) == 2:
+        return f"{string_list[0]} and {string_list[1]}"
+
     return ', '.join(string_list[:-1]) + ' and ' + string_list[-1]
 
+@functools.lru_cache(maxsize=8192)
 def extract_swid_from_memo(memo) -> tuple[str, int, str]:
     """
     Use regex to find the ID tag in brackets, e.g., [SWID12345]
 
+    Memoized since the same memo string is parsed several times per sync
+    (dedup, deletion, and update-check paths all re-parse it).
+
     Args:
         memo (str): The memo field of a transaction
 
     Returns:
         tuple[str, int, str]: The full match, the ID number, and the truncated hash
     """
-    match = re.search(r"\[SWID:(\d+)-(\w+)\]", memo)
+    match = _SWID_RE.search(memo)
     if match:
         return match.group(0), int(match.group(1)), match.group(2) 
     return None, None, None
@@ -47,12 +80,23 @@ def check_if_needs_to_update(sw_expense: dict, ynab_transaction: dict) -> bool:
     YNAB transaction should update if the SWID hash changes but the expense ID is the same.
     """
     logger = logging.getLogger(__name__)
-    expense_swid = sw_expense.get('swid', '')
-    _, expense_swid, _ = extract_swid_from_memo(sw_expense.get('swid', ''))
+    # Cheapest checks first: bail on a missing updated time or on strings
+    # that can't contain a tag (substring test) before any regex runs.
+    sw_update_time = sw_expense.get('updated_time', '')
+    if not sw_update_time:
+        logger.warning(f"No updated time found in Splitwise expense {sw_expense}")
+        return False
+    if '[SWID:' not in sw_expense.get('swid', ''):
+        logger.warning(f"No SWID found in Splitwise expense {sw_expense['id']}")
+        return False
+    if '[SWID:' not in ynab_transaction.get('memo', ''):
+        logger.warning(f"No SWID found in YNAB transaction {ynab_transaction['id']}")
+        return False
+    _, expense_swid, _ = extract_swid_from_memo(sw_expense['swid'])
     if not expense_swid:
         logger.warning(f"No SWID found in Splitwise expense {sw_expense['id']}")
         return False
-    _, ynab_swid, ynab_hash = extract_swid_from_memo(ynab_transaction.get('memo', ''))
+    _, ynab_swid, ynab_hash = extract_swid_from_memo(ynab_transaction['memo'])
     if not ynab_swid:
         logger.warning(f"No SWID found in YNAB transaction {ynab_transaction['id']}")
         return False
@@ -62,30 +106,63 @@ def check_if_needs_to_update(sw_expense: dict, ynab_transaction: dict) -> bool:
         logger.error(f"SWID mismatch: {ynab_swid} != {expense_swid}")
         return False
 
-    sw_update_time = sw_expense.get('updated_time', '')
-    if not sw_update_time:
-        logger.warning(f"No updated time found in Splitwise expense {sw_expense}")
-        return False
+    return generate_truncated_hash_for_updated_time(sw_update_time) != ynab_hash
+
+def check_if_needs_to_update_many(sw_expenses, ynab_transactions) -> list:
+    """
+    Bulk form of check_if_needs_to_update.
 
-    generated_hash_for_sw_update_time = generate_truncated_hash_for_updated_time(sw_update_time)
-    return ynab_swid == expense_swid and generated_hash_for_sw_update_time != ynab_hash
+    Keys the YNAB transactions by SWID once, then joins the Splitwise
+    expenses against that index, so reconciling N expenses against M
+    transactions is O(N + M) instead of N*M paired scans.
 
+    Returns:
+        list[tuple]: (sw_expense, ynab_transaction) pairs whose updated-time
+        hash no longer matches the one recorded in the YNAB memo.
+    """
+    ynab_by_swid = {}
+    for transaction in ynab_transactions:
+        _, swid, short_hash = extract_swid_from_memo(transaction.get('memo', ''))
+        if swid is not None:
+            ynab_by_swid[swid] = (transaction, short_hash)
+
+    needs_update = []
+    for expense in sw_expenses:
+        updated_time = expense.get('updated_time')
+        if not updated_time:
+            continue
+        _, swid, _ = extract_swid_from_memo(expense.get('swid', ''))
+        if swid is None:
+            continue
+        pair = ynab_by_swid.get(swid)
+        if pair is not None and generate_truncated_hash_for_updated_time(updated_time) != pair[1]:
+            needs_update.append((expense, pair[0]))
+    return needs_update
+
+@functools.lru_cache(maxsize=4096)
 def generate_truncated_hash_for_updated_time(updated_at: str):
     """
     Useful for generating a unique identifier for a splitwise expense combined with updated date.
 
+    Memoized: each expense's timestamp is hashed once for the memo tag and
+    again inside check_if_needs_to_update, so repeats skip the encode+hash.
+
     Args:
         updated_at (str): The timestamp of the last update to the expense. From expense.getUpdatedAt()
 
     Returns:
         str: 4 character hash to represent the updated time
     """
-    # Create an MD5 hash of the combined string
-    hash_object = hashlib.md5(updated_at.encode())
+    # Create an MD5 hash of the combined string. MD5 is kept (rather than a
+    # faster algorithm) so hashes in memos already written to YNAB keep
+    # matching; usedforsecurity=False takes OpenSSL's fast non-FIPS path.
+    # Timestamps are pure ASCII, so encode('ascii') takes CPython's direct
+    # path instead of the general UTF-8 encoder.
+    hash_object = hashlib.md5(updated_at.encode('ascii'), usedforsecurity=False)
 
     # Truncate the hash to 4 characters for conciseness
     # This should still prevent collisions
-    short_hash = hash_object.hexdigest()[:4]
+    short_hash = hash_object.digest()[:2].hex()
     return short_hash
 
 def construct_memo_swid_tag(expense_id: int, updated_at: str):
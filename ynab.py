@@ -3,8 +3,20 @@ import logging
 import os
 import re
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
 from utils import setup_environment_vars
 
+try:
+    # C-level JSON decode/encode is several times faster than the stdlib on
+    # large transaction responses; fall back to requests' parser without it.
+    import orjson
+except ImportError:
+    orjson = None
+
+# Compiled once at import; create_import_id validates a date per transaction.
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
 class YNABClient:
     BASE_URL = "https://api.youneedabudget.com/v1"
 
@@ -15,6 +27,19 @@ class YNABClient:
             "Content-Type": "application/json"
         }
         self.logger = logging.getLogger(__name__)
+        # One pooled session for all calls: keep-alive skips the TCP/TLS
+        # handshake per request, and the pool is sized for the concurrent
+        # fetches issued from the sync paths.
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        self._session.mount(
+            "https://", requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        )
+        # Budget/account/category ids are invariant for a run; cache resolved
+        # lookups so repeat resolutions skip the HTTP round-trip and scan.
+        self._budget_id_cache = {}
+        self._account_id_cache = {}
+        self._category_id_cache = {}
 
     def _make_request(self, method, endpoint, params=None, data=None):
         url = f"{self.BASE_URL}/{endpoint}"
@@ -25,10 +50,17 @@ class YNABClient:
         last_exc = None
         for attempt in range(2):
             try:
-                response = requests.request(
-                    method, url, headers=self.headers, params=params, json=data,
-                    timeout=(10, 120),
-                )
+                if orjson is not None:
+                    response = self._session.request(
+                        method, url, params=params,
+                        data=orjson.dumps(data) if data is not None else None,
+                        timeout=(10, 120),
+                    )
+                else:
+                    response = self._session.request(
+                        method, url, params=params, json=data,
+                        timeout=(10, 120),
+                    )
                 break
             except (requests.Timeout, requests.ConnectionError) as exc:
                 last_exc = exc
@@ -39,15 +71,20 @@ class YNABClient:
         else:
             raise last_exc
         response.raise_for_status()  # Raise an exception for HTTP errors
+        if orjson is not None:
+            return orjson.loads(response.content)
         return response.json()
 
     def get_budgets(self):
         return self._make_request("GET", "budgets")
     
     def get_budget_id(self, budget_name):
+        if budget_name in self._budget_id_cache:
+            return self._budget_id_cache[budget_name]
         budgets = self.get_budgets()
         for budget in budgets['data']['budgets']:
             if budget['name'] == budget_name:
+                self._budget_id_cache[budget_name] = budget['id']
                 return budget['id']
         return None
 
@@ -63,7 +100,7 @@ class YNABClient:
         """
         # return none if date is not a string with "YYYY-MM-DD" format
         # Check date format with regex.
-        if not (isinstance(date, str) and re.match(r"\d{4}-\d{2}-\d{2}", date)):
+        if not (isinstance(date, str) and _DATE_RE.match(date)):
             self.logger.error(f"Invalid date format: {date}. Expected 'YYYY-MM-DD'.")
             return None
         import_id = f"YNAB:{str(amount)}:{date}"
@@ -85,22 +122,61 @@ class YNABClient:
         return self._make_request("GET", f"budgets/{budget_id}/accounts")
     
     def get_account_id(self, budget_id, account_name):
-        accounts = self.get_accounts(budget_id)
-        for account in accounts['data']['accounts']:
-            if account['name'].strip() == account_name.strip():
-                return account['id']
-        return None
+        key = (budget_id, account_name.strip())
+        if key not in self._account_id_cache:
+            # One fetch indexes every account in the budget, so further
+            # lookups against it are dict probes instead of rescans.
+            accounts = self.get_accounts(budget_id)
+            self._account_id_cache.update(
+                ((budget_id, account['name'].strip()), account['id'])
+                for account in accounts['data']['accounts']
+            )
+        return self._account_id_cache.get(key)
 
     def get_categories(self, budget_id):
         return self._make_request("GET", f"budgets/{budget_id}/categories")
     
     def get_category_id(self, budget_id, category_name):
-        categories = self.get_categories(budget_id)
-        for category_group in categories['data']['category_groups']:
-            for category in category_group['categories']:
-                if category['name'].strip() == category_name.strip():
-                    return category['id']
-        return None
+        key = (budget_id, category_name.strip())
+        if key not in self._category_id_cache:
+            # Index the whole group/category tree in one pass rather than
+            # nested-scanning it per lookup.
+            categories = self.get_categories(budget_id)
+            self._category_id_cache.update(
+                ((budget_id, category['name'].strip()), category['id'])
+                for category_group in categories['data']['category_groups']
+                for category in category_group['categories']
+            )
+        return self._category_id_cache.get(key)
+
+    def prefetch(self, budget_name):
+        """
+        Warm the id caches for a budget up front.
+
+        Resolves the budget id, then fetches its accounts and categories
+        concurrently on the pooled session, so later get_account_id /
+        get_category_id calls are dict probes instead of sequential GETs.
+
+        Returns the budget id, or None when the budget is unknown.
+        """
+        budget_id = self.get_budget_id(budget_name)
+        if budget_id is None:
+            return None
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            accounts_future = executor.submit(self.get_accounts, budget_id)
+            categories_future = executor.submit(self.get_categories, budget_id)
+            accounts = accounts_future.result()
+            categories = categories_future.result()
+        self._account_id_cache.update(
+            ((budget_id, account['name'].strip()), account['id'])
+            for account in accounts['data']['accounts']
+        )
+        self._category_id_cache.update(
+            ((budget_id, category['name'].strip()), category['id'])
+            for category_group in categories['data']['category_groups']
+            for category in category_group['categories']
+        )
+        return budget_id
 
     def get_transactions(self, budget_id, account_id=None, since_date=None, before_date=None):
         endpoint = f"budgets/{budget_id}/transactions"
@@ -120,17 +196,19 @@ class YNABClient:
         return self._make_request("GET", endpoint)
 
     def get_last_transaction(self, budget_id, account_id):
-        transactions = self.get_transactions(budget_id, account_id)
+        # Bound the fetch to recent history first; downloading every
+        # transaction on the account just to keep one row wastes bandwidth
+        # on long-lived accounts. Fall back to the full fetch only if the
+        # window comes back empty.
+        since_date = (date.today() - timedelta(days=60)).isoformat()
+        transactions = self.get_transactions(budget_id, account_id, since_date=since_date)
+        if not transactions['data']['transactions']:
+            transactions = self.get_transactions(budget_id, account_id)
         if not transactions['data']['transactions']:
             return None  # No transactions found
 
-        # Sort transactions by date in descending order and pick the first one
-        last_transaction = sorted(
-            transactions['data']['transactions'], 
-            key=lambda x: x['date'], 
-            reverse=True
-        )[0]
-        return last_transaction
+        # max() finds the latest date in one pass without building a sorted copy
+        return max(transactions['data']['transactions'], key=lambda x: x['date'])
     
     def update_transaction(self, budget_id, transaction_id, transaction_data):
         endpoint = f"budgets/{budget_id}/transactions/{transaction_id}"
@@ -157,7 +235,7 @@ if __name__ == "__main__":
 
     client = YNABClient(personal_access_token)
 
-    budget_id = client.get_budget_id(ynab_budget_name)
+    budget_id = client.prefetch(ynab_budget_name)
     account_id = client.get_account_id(budget_id, ynab_account_name)
 
     # Create a transaction